@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+End-to-end performance benchmark for the Utility Consumption Prediction System.
+
+Runs the FastAPI app in-process against the bundled data/ files with a small
+model trained on the fly, and reports throughput, p50/p95/p99 latency, model
+training time and peak RSS. Results are written as JSON; pass --compare to
+fail when a metric regresses past --threshold against a stored baseline.
+The run also fails if any request returns a non-200 status.
+
+Usage:
+    python scripts/benchmark.py --requests 100 --concurrency 8
+    python scripts/benchmark.py --output baseline.json
+    python scripts/benchmark.py --compare baseline.json --threshold 0.2 --tail-threshold 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from benchmark_compare import check_compatibility, compare_results, failed_requests
+
+try:
+    import resource
+    resource_available = True
+except ImportError:
+    # Not available on Windows; peak RSS is reported as null there
+    resource_available = False
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+API_DIR = PROJECT_ROOT / 'backend' / 'api'
+SERVICES_DIR = PROJECT_ROOT / 'backend' / 'services'
+CLEANED_DATA_PATH = PROJECT_ROOT / 'data' / 'processed' / 'cleaned_utility_data.csv'
+RAW_DATA_PATH = PROJECT_ROOT / 'data' / 'raw' / 'Utility_consumption.csv'
+
+# Features passed to the model by the /predict endpoint
+PREDICT_FEATURES = ['Temperature', 'Humidity', 'WindSpeed', 'is_holiday',
+                    'hour', 'dayofweek', 'month', 'is_weekend']
+POWER_COLUMNS = ['F1_132KV_PowerConsumption', 'F2_132KV_PowerConsumption',
+                 'F3_132KV_PowerConsumption']
+
+# Counters that are totalled across repeated runs instead of taking the median
+SUMMED_KEYS = ('requests', 'errors', 'calls')
+
+
+def peak_rss_mb():
+    """Return the peak resident set size of this process in MB."""
+    if not resource_available:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    if sys.platform == 'darwin':
+        return max_rss / (1024 * 1024)
+    return max_rss / 1024
+
+
+def load_training_frame(rows: int):
+    """Load the cleaned dataset and derive the /predict feature columns."""
+    df = pd.read_csv(CLEANED_DATA_PATH, parse_dates=['Datetime'])
+    if rows and rows < len(df):
+        df = df.sample(n=rows, random_state=42).sort_values('Datetime')
+    df['is_holiday'] = 0
+    df['hour'] = df['Datetime'].dt.hour
+    df['dayofweek'] = df['Datetime'].dt.dayofweek
+    df['month'] = df['Datetime'].dt.month
+    df['is_weekend'] = (df['dayofweek'] >= 5).astype(int)
+    df['Total_Power'] = df[POWER_COLUMNS].sum(axis=1)
+    return df
+
+
+def train_benchmark_model(df, n_estimators: int):
+    """Train a small model matching the feature layout used by /predict."""
+    model = RandomForestRegressor(n_estimators=n_estimators, max_depth=12,
+                                  random_state=42, n_jobs=1)
+    model.fit(df[PREDICT_FEATURES], df['Total_Power'])
+    return model
+
+
+def add_backend_paths():
+    """Make the backend modules importable the way they are run in the app."""
+    for path in (API_DIR, SERVICES_DIR):
+        if str(path) not in sys.path:
+            sys.path.insert(0, str(path))
+
+
+def import_app():
+    """Import the FastAPI app module from backend/api."""
+    add_backend_paths()
+    import main
+    return main
+
+
+async def call_asgi(app, method: str, path: str, query: str = '', body: bytes = b''):
+    """Send a single HTTP request to an ASGI app and return the status code."""
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [(b'host', b'benchmark'),
+                    (b'content-type', b'application/json'),
+                    (b'content-length', str(len(body)).encode())],
+        'client': ('127.0.0.1', 0),
+        'server': ('benchmark', 80),
+    }
+    request_sent = False
+    response_complete = asyncio.Event()
+    status = None
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+        # Like uvicorn, report a disconnect once the response has been sent
+        await response_complete.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        elif message['type'] == 'http.response.body' and not message.get('more_body', False):
+            response_complete.set()
+
+    await app(scope, receive, send)
+    return status
+
+
+async def run_load(app, make_request, total_requests: int, concurrency: int,
+                   timeout: float = 30.0):
+    """Issue requests from a fixed number of concurrent clients.
+
+    Each client times its request from the moment it is issued, then yields
+    so the other clients can issue theirs before the app serves it. Handlers
+    that block the event loop therefore show up as queueing latency that
+    grows with concurrency, as they would behind a single-worker server.
+    """
+    latencies = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal errors, next_index
+        while next_index < total_requests:
+            index = next_index
+            next_index += 1
+            method, path, query, body = make_request(index)
+            start = time.perf_counter()
+            await asyncio.sleep(0)
+            try:
+                status = await asyncio.wait_for(
+                    call_asgi(app, method, path, query, body), timeout)
+            except Exception:
+                # Unhandled app errors and timeouts count as failed requests
+                status = None
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def summarize_latencies(latencies, errors: int, elapsed: float, concurrency: int):
+    """Build throughput and latency percentile metrics for one endpoint."""
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'concurrency': concurrency,
+        'throughput_rps': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'latency_p50_ms': float(np.percentile(latencies_ms, 50)),
+        'latency_p95_ms': float(np.percentile(latencies_ms, 95)),
+        'latency_p99_ms': float(np.percentile(latencies_ms, 99)),
+        'latency_mean_ms': float(latencies_ms.mean()),
+    }
+
+
+def predict_request(index: int):
+    """Build a /predict request with varying weather and start time."""
+    payload = {
+        'temperature': 15 + (index % 25),
+        'humidity': 40 + (index % 50),
+        'wind_speed': 0.5 + (index % 5),
+        'datetime': f'2017-{(index % 12) + 1:02d}-15T{index % 24:02d}:00:00',
+    }
+    return 'POST', '/predict', '', json.dumps(payload).encode()
+
+
+def make_historical_request(limit: int, total_rows: int):
+    """Return a /historical-data request builder paging through the dataset."""
+    def historical_request(index: int):
+        offset = (index * limit) % max(total_rows - limit, 1)
+        return 'GET', '/historical-data', f'limit={limit}&offset={offset}', b''
+    return historical_request
+
+
+def median_of_runs(runs):
+    """Combine per-run metric dicts, taking the median of each value."""
+    combined = {}
+    for key in runs[0]:
+        values = [run[key] for run in runs]
+        if key in SUMMED_KEYS:
+            combined[key] = sum(values)
+        elif all(value == values[0] for value in values):
+            combined[key] = values[0]
+        else:
+            combined[key] = float(np.median(values))
+    combined['runs'] = len(runs)
+    return combined
+
+
+def benchmark_endpoint(app, make_request, args):
+    """Warm up an endpoint, then load it args.repeat times and take the median."""
+    if args.warmup:
+        asyncio.run(run_load(app, make_request, args.warmup, args.concurrency,
+                             args.request_timeout))
+    runs = []
+    for _ in range(args.repeat):
+        latencies, errors, elapsed = asyncio.run(
+            run_load(app, make_request, args.requests, args.concurrency,
+                     args.request_timeout))
+        runs.append(summarize_latencies(latencies, errors, elapsed, args.concurrency))
+    return median_of_runs(runs)
+
+
+def time_calls(func, repeats: int, warmup: int = 0):
+    """Time repeated calls of func and return latency percentiles in ms."""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings = np.array(timings)
+    return {
+        'calls': repeats,
+        'latency_p50_ms': float(np.percentile(timings, 50)),
+        'latency_p95_ms': float(np.percentile(timings, 95)),
+        'latency_p99_ms': float(np.percentile(timings, 99)),
+    }
+
+
+def benchmark_train_model(df, work_dir: Path, repeat: int):
+    """Time ModelService.train_model on a CSV written from the given frame."""
+    add_backend_paths()
+    from model_service import ModelService
+
+    data_path = work_dir / 'train_sample.csv'
+    df[['Temperature', 'Humidity', 'WindSpeed', 'F1_132KV_PowerConsumption']].to_csv(
+        data_path, index=False)
+    runs = []
+    for _ in range(repeat):
+        service = ModelService()
+        start = time.perf_counter()
+        result = service.train_model(str(data_path))
+        elapsed = time.perf_counter() - start
+        if not result.get('success'):
+            raise RuntimeError(f"ModelService.train_model failed: {result.get('error')}")
+        runs.append({
+            'rows': len(df),
+            'train_time_s': elapsed,
+            'r2': float(result['r2']),
+        })
+    return median_of_runs(runs)
+
+
+def build_environment(args):
+    """Describe the run configuration and interpreter the results depend on."""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'train_rows': args.train_rows,
+            'n_estimators': args.n_estimators,
+            'history_limit': args.history_limit,
+            'feature_repeats': args.feature_repeats,
+            'warmup': args.warmup,
+            'repeat': args.repeat,
+            'request_timeout': args.request_timeout,
+        },
+    }
+
+
+def run_benchmarks(args):
+    """Run every benchmark and return the results document."""
+    results = {'timestamp': datetime.now().isoformat(), **build_environment(args), 'metrics': {}}
+    metrics = results['metrics']
+
+    print("Loading data and training benchmark model...")
+    df = load_training_frame(args.train_rows)
+    start = time.perf_counter()
+    model = train_benchmark_model(df, args.n_estimators)
+    # Informational only: this times the harness's own model, not repo code
+    metrics['benchmark_model'] = {
+        'rows': len(df),
+        'train_time_s': time.perf_counter() - start,
+    }
+
+    print("Timing ModelService.train_model...")
+    with tempfile.TemporaryDirectory() as work_dir:
+        metrics['model_service_train'] = benchmark_train_model(
+            df, Path(work_dir), args.repeat)
+
+    # /historical-data reads ../../data/raw relative to the working directory,
+    # so run from backend/api to hit the bundled CSV instead of the mock data
+    original_cwd = os.getcwd()
+    os.chdir(API_DIR)
+    try:
+        api_module = import_app()
+        api_module.model = model
+
+        print("Timing feature generation...")
+        base_datetime = datetime(2017, 6, 1)
+        weather = api_module.generate_weather_forecast(base_datetime, hours=24)
+        metrics['weather_forecast'] = median_of_runs([
+            time_calls(lambda: api_module.generate_weather_forecast(base_datetime, hours=24),
+                       args.feature_repeats, args.warmup)
+            for _ in range(args.repeat)])
+        metrics['feature_generation'] = median_of_runs([
+            time_calls(lambda: api_module.create_features_for_prediction(weather, base_datetime),
+                       args.feature_repeats, args.warmup)
+            for _ in range(args.repeat)])
+
+        load_desc = (f"{args.requests} requests x {args.repeat} runs, "
+                     f"concurrency {args.concurrency}, {args.warmup} warm-up")
+        print(f"Benchmarking /predict ({load_desc})...")
+        metrics['predict'] = benchmark_endpoint(api_module.app, predict_request, args)
+
+        print(f"Benchmarking /historical-data ({load_desc})...")
+        with open(RAW_DATA_PATH) as f:
+            raw_rows = sum(1 for _ in f) - 1
+        historical_request = make_historical_request(args.history_limit, raw_rows)
+        metrics['historical_data'] = benchmark_endpoint(api_module.app, historical_request, args)
+    finally:
+        os.chdir(original_cwd)
+
+    metrics['process'] = {'peak_rss_mb': peak_rss_mb()}
+    return results
+
+
+def print_summary(results: dict):
+    """Print a human-readable summary of the benchmark results."""
+    metrics = results['metrics']
+    print("\n" + "=" * 50)
+    print("Benchmark results")
+    print("=" * 50)
+    for endpoint in ('predict', 'historical_data'):
+        m = metrics[endpoint]
+        print(f"{endpoint:<18} {m['throughput_rps']:>8.1f} req/s  "
+              f"p50 {m['latency_p50_ms']:.2f} ms  p95 {m['latency_p95_ms']:.2f} ms  "
+              f"p99 {m['latency_p99_ms']:.2f} ms  errors {m['errors']}")
+    for name in ('weather_forecast', 'feature_generation'):
+        m = metrics[name]
+        print(f"{name:<18} p50 {m['latency_p50_ms']:.3f} ms  p95 {m['latency_p95_ms']:.3f} ms  "
+              f"p99 {m['latency_p99_ms']:.3f} ms")
+    train = metrics['model_service_train']
+    print(f"train_model        {train['train_time_s']:.2f} s on {train['rows']} rows "
+          f"(R² {train['r2']:.3f})")
+    rss = metrics['process']['peak_rss_mb']
+    print(f"peak RSS           {rss:.1f} MB" if rss is not None else "peak RSS           n/a")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the prediction API and model training.")
+    parser.add_argument('--requests', type=int, default=100,
+                        help="Requests per endpoint (default: 100)")
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help="Concurrent in-flight requests (default: 8)")
+    parser.add_argument('--train-rows', type=int, default=5000,
+                        help="Rows sampled from the cleaned data for training, 0 for all (default: 5000)")
+    parser.add_argument('--n-estimators', type=int, default=20,
+                        help="Trees in the on-the-fly benchmark model (default: 20)")
+    parser.add_argument('--history-limit', type=int, default=100,
+                        help="Page size for /historical-data requests (default: 100)")
+    parser.add_argument('--feature-repeats', type=int, default=200,
+                        help="Calls per feature generation benchmark (default: 200)")
+    parser.add_argument('--warmup', type=int, default=10,
+                        help="Untimed warm-up requests/calls before each benchmark (default: 10)")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Timed runs per benchmark; the median is reported (default: 3)")
+    parser.add_argument('--request-timeout', type=float, default=30.0,
+                        help="Seconds before a request counts as failed (default: 30)")
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help="Path for the JSON results (default: benchmark_results.json)")
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help="Baseline results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Allowed relative regression for p50/mean latency, throughput, "
+                             "training time and RSS (default: 0.2 = 20%%)")
+    parser.add_argument('--tail-threshold', type=float, default=0.5,
+                        help="Allowed relative regression for p95/p99 latency (default: 0.5 = 50%%)")
+    args = parser.parse_args(argv)
+    if args.requests < 1 or args.concurrency < 1 or args.repeat < 1:
+        parser.error("--requests, --concurrency and --repeat must be at least 1")
+    if args.warmup < 0:
+        parser.error("--warmup must not be negative")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Resolve paths before run_benchmarks changes the working directory
+    output_path = Path(args.output).resolve()
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        # Check before running so a mismatched baseline fails fast
+        config_mismatches, environment_mismatches = check_compatibility(
+            build_environment(args), baseline)
+        if environment_mismatches:
+            print("⚠️ WARNING: baseline was recorded in a different environment; "
+                  "results may not be comparable:")
+            for mismatch in environment_mismatches:
+                print(f"   {mismatch}")
+        if config_mismatches:
+            print("✗ Refusing to compare: benchmark config differs from the baseline:")
+            for mismatch in config_mismatches:
+                print(f"   {mismatch}")
+            return 1
+
+    results = run_benchmarks(args)
+    print_summary(results)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✓ Results written to {output_path}")
+
+    exit_code = 0
+    failed = failed_requests(results['metrics'])
+    if failed:
+        print("\n✗ Requests failed during: " + ", ".join(failed))
+        exit_code = 1
+
+    if baseline is not None:
+        regressions = compare_results(results, baseline, args.threshold, args.tail_threshold)
+        if regressions:
+            print(f"\n✗ {len(regressions)} metric(s) regressed: " + ", ".join(regressions))
+            exit_code = 1
+        else:
+            print("\n✓ No regressions beyond threshold")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
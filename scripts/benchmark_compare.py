@@ -0,0 +1,116 @@
+"""
+Regression checks for results written by scripts/benchmark.py.
+
+Kept free of third-party imports so the pass/fail logic can be unit-tested
+without the full backend environment.
+"""
+
+# Metrics where a larger value is an improvement; everything else is
+# compared as lower-is-better
+HIGHER_IS_BETTER = ('throughput_rps',)
+
+# Stable statistics gated by --threshold
+STABLE_METRICS = ('throughput_rps', 'latency_p50_ms', 'latency_mean_ms',
+                  'train_time_s', 'peak_rss_mb')
+
+# Tail latencies are noisier and are gated by the looser --tail-threshold
+TAIL_METRICS = ('latency_p95_ms', 'latency_p99_ms')
+
+# Groups reported for information only (the harness's own model training)
+INFO_ONLY_GROUPS = ('benchmark_model',)
+
+# Top-level result fields that should match for a comparison to be meaningful
+ENVIRONMENT_KEYS = ('python', 'platform')
+
+
+def flatten_metrics(metrics: dict):
+    """Flatten nested metrics into {'group.metric': value} for numeric values."""
+    flat = {}
+    for group, values in metrics.items():
+        for name, value in values.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                flat[f'{group}.{name}'] = value
+    return flat
+
+
+def split_name(name: str):
+    """Split 'group.metric' into its group and metric parts."""
+    group, metric = name.split('.', 1)
+    return group, metric
+
+
+def is_compared_metric(name: str):
+    """Return True for metrics that are checked for regressions."""
+    group, metric = split_name(name)
+    if group in INFO_ONLY_GROUPS:
+        return False
+    return metric == 'errors' or metric in STABLE_METRICS or metric in TAIL_METRICS
+
+
+def failed_requests(metrics: dict):
+    """Return the names of benchmarks that recorded failed requests."""
+    return sorted(group for group, values in metrics.items()
+                  if values.get('errors', 0) > 0)
+
+
+def check_compatibility(current: dict, baseline: dict):
+    """Return (config mismatches, environment mismatches) between two results."""
+    config_mismatches = []
+    current_config = current.get('config', {})
+    baseline_config = baseline.get('config', {})
+    for key in sorted(set(current_config) | set(baseline_config)):
+        if current_config.get(key) != baseline_config.get(key):
+            config_mismatches.append(
+                f"config.{key}: baseline {baseline_config.get(key)!r}, "
+                f"current {current_config.get(key)!r}")
+
+    environment_mismatches = []
+    for key in ENVIRONMENT_KEYS:
+        if current.get(key) != baseline.get(key):
+            environment_mismatches.append(
+                f"{key}: baseline {baseline.get(key)!r}, current {current.get(key)!r}")
+    return config_mismatches, environment_mismatches
+
+
+def compare_results(current: dict, baseline: dict, threshold: float, tail_threshold: float):
+    """Compare metrics against a baseline and return a list of regressions."""
+    current_flat = flatten_metrics(current['metrics'])
+    baseline_flat = flatten_metrics(baseline['metrics'])
+    regressions = []
+
+    print(f"\nComparison against baseline (threshold {threshold:.0%}, "
+          f"tail threshold {tail_threshold:.0%})")
+    print("-" * 72)
+    for name in sorted(set(current_flat) | set(baseline_flat)):
+        if not is_compared_metric(name):
+            continue
+        metric = split_name(name)[1]
+        old, new = baseline_flat.get(name), current_flat.get(name)
+
+        if new is None:
+            print(f"✗ {name:<40} missing from current results")
+            regressions.append(name)
+            continue
+        if metric == 'errors':
+            # Any failed request is a regression, however fast it failed
+            regressed = new > 0 or (old is not None and new > old)
+            marker = "✗" if regressed else "✓"
+            print(f"{marker} {name:<40} {old if old is not None else 'n/a':>11} -> {new:>11}")
+            if regressed:
+                regressions.append(name)
+            continue
+        if old is None:
+            print(f"- {name:<40} not in baseline, skipped")
+            continue
+        if old == 0:
+            print(f"- {name:<40} baseline is 0, skipped")
+            continue
+
+        change = (new - old) / old
+        limit = tail_threshold if metric in TAIL_METRICS else threshold
+        regressed = -change > limit if metric in HIGHER_IS_BETTER else change > limit
+        marker = "✗" if regressed else "✓"
+        print(f"{marker} {name:<40} {old:>11.3f} -> {new:>11.3f} ({change:+.1%})")
+        if regressed:
+            regressions.append(name)
+    return regressions
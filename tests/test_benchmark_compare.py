@@ -0,0 +1,130 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from benchmark_compare import (check_compatibility, compare_results, failed_requests,
+                               flatten_metrics, is_compared_metric)
+
+CONFIG = {'requests': 100, 'concurrency': 8, 'repeat': 3}
+
+
+def make_results(metrics, config=None, python='3.11.7', platform='Linux'):
+    return {'python': python, 'platform': platform,
+            'config': dict(config or CONFIG), 'metrics': metrics}
+
+
+def endpoint(**overrides):
+    values = {'requests': 300, 'errors': 0, 'concurrency': 8, 'throughput_rps': 100.0,
+              'latency_p50_ms': 10.0, 'latency_p95_ms': 20.0, 'latency_p99_ms': 30.0,
+              'latency_mean_ms': 12.0}
+    values.update(overrides)
+    return values
+
+
+def compare(current_metrics, baseline_metrics, threshold=0.2, tail_threshold=0.5):
+    return compare_results(make_results(current_metrics), make_results(baseline_metrics),
+                           threshold, tail_threshold)
+
+
+def test_flatten_metrics_keeps_numeric_values_only():
+    flat = flatten_metrics({'process': {'peak_rss_mb': 120.5, 'label': 'x', 'ok': True}})
+    assert flat == {'process.peak_rss_mb': 120.5}
+
+
+def test_is_compared_metric():
+    assert is_compared_metric('predict.latency_p50_ms')
+    assert is_compared_metric('predict.throughput_rps')
+    assert is_compared_metric('predict.errors')
+    assert is_compared_metric('model_service_train.train_time_s')
+    assert not is_compared_metric('predict.requests')
+    assert not is_compared_metric('model_service_train.r2')
+    assert not is_compared_metric('benchmark_model.train_time_s')
+
+
+def test_unchanged_results_pass():
+    assert compare({'predict': endpoint()}, {'predict': endpoint()}) == []
+
+
+def test_lower_is_better_regression():
+    regressions = compare({'predict': endpoint(latency_p50_ms=13.0)},
+                          {'predict': endpoint()})
+    assert regressions == ['predict.latency_p50_ms']
+
+
+def test_lower_is_better_improvement_passes():
+    assert compare({'predict': endpoint(latency_p50_ms=5.0)}, {'predict': endpoint()}) == []
+
+
+def test_throughput_drop_is_regression():
+    regressions = compare({'predict': endpoint(throughput_rps=70.0)},
+                          {'predict': endpoint()})
+    assert regressions == ['predict.throughput_rps']
+
+
+def test_throughput_rise_passes():
+    assert compare({'predict': endpoint(throughput_rps=200.0)}, {'predict': endpoint()}) == []
+
+
+def test_tail_latency_uses_tail_threshold():
+    current = {'predict': endpoint(latency_p99_ms=40.0)}
+    assert compare(current, {'predict': endpoint()}) == []
+    assert compare({'predict': endpoint(latency_p99_ms=50.0)},
+                   {'predict': endpoint()}) == ['predict.latency_p99_ms']
+
+
+def test_benchmark_model_is_not_gated():
+    current = {'benchmark_model': {'rows': 5000, 'train_time_s': 10.0}}
+    baseline = {'benchmark_model': {'rows': 5000, 'train_time_s': 1.0}}
+    assert compare(current, baseline) == []
+
+
+def test_zero_baseline_is_skipped():
+    current = {'process': {'peak_rss_mb': 150.0}}
+    baseline = {'process': {'peak_rss_mb': 0}}
+    assert compare(current, baseline) == []
+
+
+def test_metric_missing_from_baseline_is_skipped():
+    current = {'predict': endpoint(), 'process': {'peak_rss_mb': 150.0}}
+    assert compare(current, {'predict': endpoint()}) == []
+
+
+def test_metric_missing_from_current_is_regression():
+    baseline = {'predict': endpoint(), 'process': {'peak_rss_mb': 150.0}}
+    assert compare({'predict': endpoint()}, baseline) == ['process.peak_rss_mb']
+
+
+def test_fast_failing_requests_are_regression():
+    current = {'predict': endpoint(errors=20, latency_p50_ms=1.0)}
+    assert compare(current, {'predict': endpoint()}) == ['predict.errors']
+
+
+def test_errors_in_both_runs_are_regression():
+    current = {'predict': endpoint(errors=5)}
+    assert compare(current, {'predict': endpoint(errors=5)}) == ['predict.errors']
+
+
+def test_failed_requests():
+    metrics = {'predict': endpoint(errors=2), 'historical_data': endpoint(),
+               'process': {'peak_rss_mb': 100.0}}
+    assert failed_requests(metrics) == ['predict']
+
+
+def test_check_compatibility_matching():
+    assert check_compatibility(make_results({}), make_results({})) == ([], [])
+
+
+def test_check_compatibility_config_mismatch():
+    current = make_results({}, config={**CONFIG, 'requests': 5})
+    config_mismatches, environment_mismatches = check_compatibility(current, make_results({}))
+    assert len(config_mismatches) == 1
+    assert 'config.requests' in config_mismatches[0]
+    assert environment_mismatches == []
+
+
+def test_check_compatibility_environment_mismatch():
+    current = make_results({}, python='3.9.18', platform='Windows')
+    config_mismatches, environment_mismatches = check_compatibility(current, make_results({}))
+    assert config_mismatches == []
+    assert len(environment_mismatches) == 2
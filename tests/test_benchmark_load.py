@@ -0,0 +1,133 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('numpy')
+pytest.importorskip('pandas')
+pytest.importorskip('sklearn')
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from benchmark import (call_asgi, make_historical_request, median_of_runs, run_load,
+                       summarize_latencies)
+
+
+def make_app(status=200, handler_delay=0.0, blocking=False, raise_error=False):
+    """Build a stub ASGI app that records how many requests are in flight."""
+    state = {'in_flight': 0, 'max_in_flight': 0}
+
+    async def app(scope, receive, send):
+        await receive()
+        state['in_flight'] += 1
+        state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+        try:
+            if blocking:
+                time.sleep(handler_delay)
+            elif handler_delay:
+                await asyncio.sleep(handler_delay)
+            if raise_error:
+                raise RuntimeError("unhandled")
+            await send({'type': 'http.response.start', 'status': status, 'headers': []})
+            await send({'type': 'http.response.body', 'body': b'{}'})
+        finally:
+            state['in_flight'] -= 1
+
+    return app, state
+
+
+def get_request(index):
+    return 'GET', '/', '', b''
+
+
+def test_run_load_counts_successful_requests():
+    app, _ = make_app()
+    latencies, errors, elapsed = asyncio.run(run_load(app, get_request, 10, 3))
+    assert len(latencies) == 10
+    assert errors == 0
+    assert elapsed > 0
+
+
+def test_run_load_counts_error_status():
+    app, _ = make_app(status=500)
+    latencies, errors, _ = asyncio.run(run_load(app, get_request, 6, 2))
+    assert len(latencies) == 6
+    assert errors == 6
+
+
+def test_run_load_counts_unhandled_exceptions():
+    app, _ = make_app(raise_error=True)
+    latencies, errors, _ = asyncio.run(run_load(app, get_request, 5, 2))
+    assert len(latencies) == 5
+    assert errors == 5
+
+
+def test_run_load_counts_timeouts():
+    app, _ = make_app(handler_delay=1.0)
+    latencies, errors, _ = asyncio.run(run_load(app, get_request, 2, 2, timeout=0.05))
+    assert len(latencies) == 2
+    assert errors == 2
+
+
+def test_run_load_keeps_yielding_requests_in_flight():
+    app, state = make_app(handler_delay=0.01)
+    asyncio.run(run_load(app, get_request, 16, 4))
+    assert state['max_in_flight'] == 4
+
+
+def test_blocking_handler_latency_grows_with_concurrency():
+    app, _ = make_app(handler_delay=0.01, blocking=True)
+    serial = summarize_latencies(*asyncio.run(run_load(app, get_request, 16, 1)), 1)
+    concurrent = summarize_latencies(*asyncio.run(run_load(app, get_request, 16, 4)), 4)
+    # Requests queue behind each other, so latency rises while throughput does not
+    assert concurrent['latency_p50_ms'] > 2.5 * serial['latency_p50_ms']
+    assert concurrent['throughput_rps'] < 1.5 * serial['throughput_rps']
+
+
+def test_receive_reports_disconnect_after_response():
+    async def app(scope, receive, send):
+        await receive()
+        await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+        await send({'type': 'http.response.body', 'body': b''})
+        assert (await receive())['type'] == 'http.disconnect'
+
+    assert asyncio.run(asyncio.wait_for(call_asgi(app, 'GET', '/'), 1)) == 200
+
+
+def test_summarize_latencies():
+    summary = summarize_latencies([0.01, 0.02, 0.03, 0.04], 1, 2.0, 4)
+    assert summary['requests'] == 4
+    assert summary['errors'] == 1
+    assert summary['concurrency'] == 4
+    assert summary['throughput_rps'] == 2.0
+    assert summary['latency_p50_ms'] == pytest.approx(25.0)
+    assert summary['latency_mean_ms'] == pytest.approx(25.0)
+
+
+def test_median_of_runs_sums_counters_and_takes_median():
+    runs = [
+        {'requests': 10, 'errors': 0, 'concurrency': 4, 'latency_p50_ms': 10.0},
+        {'requests': 10, 'errors': 2, 'concurrency': 4, 'latency_p50_ms': 30.0},
+        {'requests': 10, 'errors': 1, 'concurrency': 4, 'latency_p50_ms': 20.0},
+    ]
+    combined = median_of_runs(runs)
+    assert combined['requests'] == 30
+    assert combined['errors'] == 3
+    assert combined['concurrency'] == 4
+    assert combined['latency_p50_ms'] == 20.0
+    assert combined['runs'] == 3
+
+
+def test_make_historical_request_offsets_wrap_within_dataset():
+    historical_request = make_historical_request(100, 1000)
+    offsets = []
+    for index in range(12):
+        method, path, query, body = historical_request(index)
+        assert (method, path, body) == ('GET', '/historical-data', b'')
+        params = dict(part.split('=') for part in query.split('&'))
+        assert params['limit'] == '100'
+        offsets.append(int(params['offset']))
+    assert offsets[:3] == [0, 100, 200]
+    assert all(0 <= offset <= 900 for offset in offsets)